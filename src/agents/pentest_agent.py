@@ -3,32 +3,40 @@ LangGraph Agent for Penetration Testing Workflow
 """
 
 import os
+import queue
+import threading
+from functools import lru_cache
 from typing import TypedDict, Annotated, Sequence, List
 from operator import add
 
 from dotenv import load_dotenv
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, AIMessageChunk
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph
 from langgraph.prebuilt import create_react_agent
 
 from tools.shell_tool import execute_shell_command
-from tools.file_tools import read_file, write_file, list_directory
+from tools.file_tools import read_file, read_file_range, write_file, list_directory
 from tools.tavily_tool import web_search
+from tools.web_enum_tool import enumerate_web_application, enumerate_web_applications
 
 # Load environment variables
 load_dotenv()
 
-# Initialize the LLM
-llm = ChatOpenAI(
-    model="gpt-4-turbo-preview", temperature=0.1, api_key=os.getenv("OPENAI_API_KEY")
-)
+# Sentinel marking the end of a streamed response
+_STREAM_END = object()
 
 
 # Load context file for system prompt
+@lru_cache(maxsize=1)
 def load_context():
-    """Load the context file content for inclusion in system prompt."""
+    """Load the context file content for inclusion in system prompt.
+
+    Cached for the process lifetime: the custom graph rebuilds the agent
+    per node invocation, and without caching each rebuild re-reads the
+    context file from disk.
+    """
     context_path = os.path.join(
         os.path.dirname(__file__), "..", "..", "config", "context.md"
     )
@@ -42,7 +50,16 @@ def load_context():
 
 
 # Define the tools available to the agent
-tools = [execute_shell_command, read_file, write_file, list_directory, web_search]
+tools = [
+    execute_shell_command,
+    read_file,
+    read_file_range,
+    write_file,
+    list_directory,
+    web_search,
+    enumerate_web_application,
+    enumerate_web_applications,
+]
 
 
 class AgentState(TypedDict):
@@ -62,6 +79,11 @@ def create_pentest_agent():
         Compiled LangGraph for the pentesting agent
     """
 
+    # Initialize the LLM
+    llm = ChatOpenAI(
+        model="gpt-4-turbo-preview", temperature=0.1, api_key=os.getenv("OPENAI_API_KEY")
+    )
+
     # Load context for the system prompt
     context_content = load_context()
 
@@ -86,8 +108,11 @@ WORKFLOW GUIDELINES:
 TOOL USAGE:
 - Use execute_shell_command for ANY security tool or Kali command (nmap, gobuster, nikto, etc.)
 - Use read_file to read wordlists, config files, command outputs, or manpages
+- Use read_file_range to peek at slices of very large files (big wordlists) instead of reading them whole
 - Use write_file to save notes, findings, scripts, or scan results
 - Use list_directory to explore filesystem and find wordlists/tools
+- Use enumerate_web_application to analyze a web app's forms, inputs, and links in a headless browser
+- Use enumerate_web_applications when several web targets are known - it scans them concurrently in one call
 - Use web_search only when local resources are insufficient
 
 CONTEXT INFORMATION:
@@ -166,9 +191,18 @@ def create_custom_pentest_graph():
     return graph
 
 
-# Create instances for import
-pentest_agent = create_pentest_agent()
-pentest_graph = create_custom_pentest_graph()
+def build_agent():
+    """
+    Build the compiled pentesting agent.
+
+    Construction is expensive (LLM client, tool bindings, graph compilation),
+    so callers should build once per process and reuse the instance
+    (e.g. behind Streamlit's @st.cache_resource).
+
+    Returns:
+        Compiled LangGraph agent ready for invoke/stream
+    """
+    return create_pentest_agent()
 
 
 def convert_messages_to_langchain(messages: list) -> List[BaseMessage]:
@@ -195,11 +229,12 @@ def convert_messages_to_langchain(messages: list) -> List[BaseMessage]:
     return langchain_messages
 
 
-def run_pentest_query(query: str, target: str = "", message_history: list = None) -> dict:
+def run_pentest_query(agent, query: str, target: str = "", message_history: list = None) -> dict:
     """
     Run a penetration testing query through the agent.
 
     Args:
+        agent: Compiled agent instance (from build_agent())
         query: User's question or request
         target: Optional target specification
         message_history: Optional list of previous messages in Streamlit format
@@ -223,6 +258,64 @@ def run_pentest_query(query: str, target: str = "", message_history: list = None
     }
 
     # Use the simpler agent for now
-    result = pentest_agent.invoke(initial_state)
+    result = agent.invoke(initial_state)
 
     return result
+
+
+def run_pentest_query_stream(agent, query: str, target: str = "", message_history: list = None):
+    """
+    Run a penetration testing query through the agent, streaming the response.
+
+    Yields LLM tokens as they are produced instead of blocking until the full
+    agent run completes, so the UI can render the answer progressively.
+
+    Args:
+        agent: Compiled agent instance (from build_agent())
+        query: User's question or request
+        target: Optional target specification
+        message_history: Optional list of previous messages in Streamlit format
+                        (dicts with "role" and "content" keys)
+
+    Yields:
+        Content chunks (strings) of the agent's response
+    """
+    # Convert message history to LangChain format if provided
+    if message_history:
+        messages = convert_messages_to_langchain(message_history)
+    else:
+        # Fallback to just the current query if no history provided
+        messages = [HumanMessage(content=query)]
+
+    initial_state = {
+        "messages": messages,
+        "scan_results": {},
+        "current_target": target,
+        "next_action": "start",
+    }
+
+    # Run the agent on a worker thread so LLM waits and tool calls don't
+    # block the Streamlit script thread; tokens flow back through a queue
+    chunk_queue: queue.Queue = queue.Queue()
+
+    def _produce():
+        try:
+            # stream_mode="messages" yields (chunk, metadata) pairs as the LLM
+            # emits tokens; only forward actual model output, not tool messages
+            for chunk, _metadata in agent.stream(initial_state, stream_mode="messages"):
+                if isinstance(chunk, AIMessageChunk) and isinstance(chunk.content, str) and chunk.content:
+                    chunk_queue.put(chunk.content)
+        except Exception as exc:  # surface worker errors to the consumer
+            chunk_queue.put(exc)
+        finally:
+            chunk_queue.put(_STREAM_END)
+
+    threading.Thread(target=_produce, daemon=True).start()
+
+    while True:
+        item = chunk_queue.get()
+        if item is _STREAM_END:
+            break
+        if isinstance(item, Exception):
+            raise item
+        yield item
@@ -8,10 +8,19 @@ Provides file system operations for the LLM agent to:
 """
 
 import os
+import mmap
 from typing import List
 
 from langchain_core.tools import tool
 
+# Files larger than this are read via mmap; below it plain read() wins
+# because syscall overhead dominates for small configs
+MMAP_THRESHOLD_BYTES = 1024 * 1024
+
+# read_file never returns more than this; larger files are truncated and
+# the agent is pointed at read_file_range for bounded slices
+READ_FILE_CAP_BYTES = 10 * 1024 * 1024
+
 
 @tool
 def read_file(file_path: str) -> str:
@@ -32,6 +41,30 @@ def read_file(file_path: str) -> str:
         read_file("/usr/share/wordlists/dirbuster/directory-list-2.3-medium.txt")
     """
     try:
+        size = os.path.getsize(file_path)
+        if size > MMAP_THRESHOLD_BYTES:
+            # Map large files (e.g. wordlists) instead of copying them
+            # through a read buffer; decode with errors="replace" since
+            # big wordlists often contain stray non-UTF-8 bytes
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                mapped = mmap.mmap(fd, size, access=mmap.ACCESS_READ)
+                try:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    content = mapped.read(READ_FILE_CAP_BYTES).decode('utf-8', errors='replace')
+                finally:
+                    mapped.close()
+            finally:
+                os.close(fd)
+
+            if size > READ_FILE_CAP_BYTES:
+                content += (
+                    f"\n\n[File truncated - showing first {READ_FILE_CAP_BYTES} of {size} bytes. "
+                    "Use read_file_range to read specific slices of large files.]"
+                )
+            return content
+
         with open(file_path, 'r', encoding='utf-8') as f:
             return f.read()
     except FileNotFoundError:
@@ -42,6 +75,52 @@ def read_file(file_path: str) -> str:
         return f"Error reading file {file_path}: {str(e)}"
 
 
+@tool
+def read_file_range(file_path: str, offset: int = 0, length: int = 65536) -> str:
+    """
+    Read a bounded slice of a file.
+
+    Useful for peeking at huge files (multi-GB wordlists, packet dumps)
+    without loading the whole file into memory. Memory use is bounded by
+    the requested length regardless of file size.
+
+    Args:
+        file_path: Path to the file to read
+        offset: Byte offset to start reading from (default: 0)
+        length: Maximum number of bytes to read (default: 65536)
+
+    Returns:
+        The requested slice as a string, or error message if it cannot be read
+
+    Example:
+        read_file_range("/usr/share/wordlists/rockyou.txt")
+        read_file_range("/usr/share/wordlists/rockyou.txt", offset=1048576, length=4096)
+    """
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            if hasattr(os, "pread"):
+                # Single positioned read, no seek state
+                data = os.pread(fd, length, offset)
+            else:
+                os.lseek(fd, offset, os.SEEK_SET)
+                data = os.read(fd, length)
+        finally:
+            os.close(fd)
+
+        if not data:
+            return f"(no data at offset {offset} in {file_path})"
+
+        return data.decode('utf-8', errors='replace')
+
+    except FileNotFoundError:
+        return f"Error: File not found: {file_path}"
+    except PermissionError:
+        return f"Error: Permission denied reading file: {file_path}"
+    except Exception as e:
+        return f"Error reading file {file_path}: {str(e)}"
+
+
 @tool
 def write_file(file_path: str, content: str, overwrite: bool = False) -> str:
     """
@@ -63,11 +142,25 @@ def write_file(file_path: str, content: str, overwrite: bool = False) -> str:
         write_file("/tmp/exploit.py", "#!/usr/bin/env python3\nprint('exploit code')", overwrite=True)
     """
     try:
-        if os.path.exists(file_path) and not overwrite:
+        data = content.encode('utf-8')
+
+        # O_EXCL makes the no-overwrite check atomic with the open, instead
+        # of a racy exists() probe followed by a separate create
+        flags = os.O_WRONLY | os.O_CREAT | (os.O_TRUNC if overwrite else os.O_EXCL)
+        try:
+            fd = os.open(file_path, flags, 0o644)
+        except FileExistsError:
             return f"Error: File already exists and overwrite=False: {file_path}"
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        try:
+            # Write the pre-encoded bytes directly, bypassing the text-mode
+            # buffered writer; memoryview slices avoid copying on short writes
+            view = memoryview(data)
+            written = 0
+            while written < len(data):
+                written += os.write(fd, view[written:])
+        finally:
+            os.close(fd)
 
         return f"Successfully wrote {len(content)} characters to {file_path}"
 
@@ -96,26 +189,25 @@ def list_directory(directory_path: str) -> str:
         list_directory("/tmp")
     """
     try:
-        if not os.path.exists(directory_path):
-            return f"Error: Directory not found: {directory_path}"
+        # Separate directories and files; scandir carries the entry type
+        # from the directory read itself, avoiding a stat() per entry.
+        # Missing/non-directory paths surface through the exception type
+        # below rather than through up-front exists/isdir probes
+        dirs = []
+        files = []
 
-        if not os.path.isdir(directory_path):
-            return f"Error: Path is not a directory: {directory_path}"
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(f"[DIR]  {entry.name}/")
+                else:
+                    files.append(f"[FILE] {entry.name}")
 
-        entries = os.listdir(directory_path)
-        if not entries:
+        if not dirs and not files:
             return f"Directory is empty: {directory_path}"
 
-        # Separate directories and files
-        dirs = []
-        files = []
-
-        for entry in sorted(entries):
-            full_path = os.path.join(directory_path, entry)
-            if os.path.isdir(full_path):
-                dirs.append(f"[DIR]  {entry}/")
-            else:
-                files.append(f"[FILE] {entry}")
+        dirs.sort()
+        files.sort()
 
         result = f"Contents of {directory_path}:\n\n"
         if dirs:
@@ -125,6 +217,10 @@ def list_directory(directory_path: str) -> str:
 
         return result
 
+    except FileNotFoundError:
+        return f"Error: Directory not found: {directory_path}"
+    except NotADirectoryError:
+        return f"Error: Path is not a directory: {directory_path}"
     except PermissionError:
         return f"Error: Permission denied listing directory: {directory_path}"
     except Exception as e:
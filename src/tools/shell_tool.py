@@ -5,11 +5,35 @@ Provides a flexible shell execution tool that allows the LLM agent to run
 any command on the Kali Linux system with timeout and output truncation.
 """
 
+import os
+import select
+import shlex
+import signal
 import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Dict
 
+from dotenv import load_dotenv
 from langchain_core.tools import tool
 
+# Load environment variables before resolving MOCK_MODE
+load_dotenv()
+
+# Mock mode (see env_example.txt) for development off the Kali host:
+# commands are reported instead of executed. Resolved once at import -
+# the value cannot change mid-process
+MOCK_MODE = os.getenv("MOCK_MODE", "False").lower() == "true"
+
+# Mock response built once at module load; per call only the command is
+# substituted in
+_MOCK_OUTPUT_TEMPLATE = (
+    "[MOCK MODE] Command not executed:\n{command}\n\n"
+    "Set MOCK_MODE=False in .env to run commands on the Kali host."
+)
+
 # Global flag to track if shell commands are enabled
 # This will be set by the main application
 shell_commands_enabled = False
@@ -18,78 +42,225 @@ shell_commands_enabled = False
 # When True, commands are queued instead of executed immediately
 confirmation_mode_enabled = False
 
-# Queue of pending commands awaiting confirmation
-pending_commands: List[Dict] = []
+# Queue of pending commands awaiting confirmation (FIFO: appended by the
+# tool, drained from the front by the UI)
+pending_commands: deque = deque()
+
+# Guards mutations of the module state above: tools may run on worker
+# threads concurrently with the Streamlit UI thread. Plain boolean reads
+# in execute_shell_command stay lock-free - a load of a bool global is
+# atomic in CPython
+_state_lock = threading.Lock()
 
 
 def set_shell_commands_enabled(enabled: bool):
     """Set whether shell commands are enabled."""
     global shell_commands_enabled
-    shell_commands_enabled = enabled
+    with _state_lock:
+        shell_commands_enabled = enabled
 
 
 def set_confirmation_mode(enabled: bool):
     """Set whether confirmation mode is enabled."""
     global confirmation_mode_enabled
-    confirmation_mode_enabled = enabled
+    with _state_lock:
+        confirmation_mode_enabled = enabled
 
 
 def get_pending_commands() -> List[Dict]:
     """Get the list of pending commands awaiting confirmation."""
-    return pending_commands.copy()
+    with _state_lock:
+        return list(pending_commands)
+
+
+def has_pending_commands() -> bool:
+    """Check whether any commands are awaiting confirmation (no copy)."""
+    return bool(pending_commands)
 
 
 def clear_pending_commands():
     """Clear all pending commands."""
-    global pending_commands
-    pending_commands = []
+    # In-place clear keeps the deque identity stable for other holders
+    with _state_lock:
+        pending_commands.clear()
 
 
 def add_pending_command(command: str, timeout: int = 300):
     """Add a command to the pending queue."""
-    pending_commands.append({"command": command, "timeout": timeout})
+    with _state_lock:
+        pending_commands.append({"command": command, "timeout": timeout})
+
+
+# Characters that require an intermediate shell: pipes, redirection,
+# globbing, substitutions, home expansion, comments. Quoting is NOT in
+# the set - shlex.split handles quotes without a shell
+_SHELL_METACHARACTERS = set("|&;<>$`*?()[]{}~#\n")
+
+
+def _split_simple_command(command: str) -> Optional[List[str]]:
+    """Split a command into argv if it can run without a shell.
+
+    Returns None when the command uses shell metacharacters, leading
+    environment assignments, or unbalanced quoting, in which case the
+    caller must fall back to shell=True.
+    """
+    if any(ch in _SHELL_METACHARACTERS for ch in command):
+        return None
+    try:
+        tokens = shlex.split(command)
+    except ValueError:
+        return None
+    if not tokens or "=" in tokens[0]:
+        return None
+    return tokens
+
+
+def _stop_process(proc: subprocess.Popen):
+    """Terminate a child's process group, escalating to kill if ignored."""
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        proc.terminate()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            proc.kill()
+        proc.wait()
 
 
 def execute_command_directly(command: str, timeout: int = 300) -> str:
     """
     Execute a shell command directly without going through the tool wrapper.
     Used for executing confirmed commands.
-    """
-    try:
-        result = subprocess.run(
-            command, shell=True, capture_output=True, text=True, timeout=timeout
-        )
 
-        output = ""
-        if result.stdout:
-            output += result.stdout
-        if result.stderr:
-            if output:
-                output += "\n--- STDERR ---\n"
-            output += result.stderr
-
-        if len(output) > MAX_OUTPUT_CHARACTERS:
-            truncated_output = output[:MAX_OUTPUT_CHARACTERS]
-            truncated_output += f"\n\n[Output truncated - showing first {MAX_OUTPUT_CHARACTERS} characters]"
-            total_chars = len(output)
-            truncated_output += f"\nTotal output length: {total_chars} characters"
-            output = truncated_output
+    Output is read incrementally from the pipe and capture stops at
+    MAX_OUTPUT_CHARACTERS: a command that floods stdout (e.g. `find /`)
+    is terminated once the cap is reached, keeping memory bounded instead
+    of buffering the full output before truncating.
+    """
+    if MOCK_MODE:
+        return _MOCK_OUTPUT_TEMPLATE.format(command=command)
 
-        if result.returncode != 0:
-            output = f"Command exited with code {result.returncode}\n\n{output}"
+    try:
+        # Plain argv commands (the common agent-generated case, e.g.
+        # "nmap -sV 10.0.0.1") skip the intermediate /bin/sh fork+exec;
+        # anything with metacharacters falls back to the shell.
+        # start_new_session puts the child in its own process group so
+        # timeout/truncation kills reap the whole pipeline
+        tokens = _split_simple_command(command)
+        if tokens is not None:
+            proc = subprocess.Popen(
+                tokens,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        else:
+            proc = subprocess.Popen(
+                command,
+                shell=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+
+        chunks = []
+        captured = 0
+        truncated = False
+        timed_out = False
+        deadline = time.monotonic() + timeout
+        stdout_fd = proc.stdout.fileno()
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+
+            ready, _, _ = select.select([proc.stdout], [], [], remaining)
+            if not ready:
+                timed_out = True
+                break
+
+            chunk = os.read(stdout_fd, 8192)
+            if not chunk:
+                break
+
+            chunks.append(chunk)
+            captured += len(chunk)
+            if captured > MAX_OUTPUT_CHARACTERS:
+                truncated = True
+                break
+
+        if timed_out:
+            _stop_process(proc)
+            return f"Command timed out after {timeout} seconds."
+
+        if truncated:
+            _stop_process(proc)
+        else:
+            # The child may close stdout while still running (e.g. after a
+            # fork); keep the overall deadline on the final wait instead of
+            # blocking indefinitely
+            try:
+                proc.wait(timeout=max(deadline - time.monotonic(), 0))
+            except subprocess.TimeoutExpired:
+                _stop_process(proc)
+                return f"Command timed out after {timeout} seconds."
+
+        output = b"".join(chunks).decode("utf-8", errors="replace")
+
+        if truncated:
+            output = (
+                f"{output[:MAX_OUTPUT_CHARACTERS]}"
+                f"\n\n[Output truncated - command stopped after {MAX_OUTPUT_CHARACTERS} characters]"
+            )
+        elif proc.returncode != 0:
+            output = f"Command exited with code {proc.returncode}\n\n{output}"
 
         if not output.strip():
             output = "(no output captured from the command)"
 
         return output
 
-    except subprocess.TimeoutExpired:
-        return f"Command timed out after {timeout} seconds."
-
     except Exception as e:
         return f"Error executing command: {str(e)}"
 
 
+def execute_commands_concurrently(commands: List[Dict], max_workers: int = 8) -> List[str]:
+    """
+    Execute several independent confirmed commands in parallel.
+
+    Commands like nmap scans or searchsploit lookups are I/O-bound external
+    processes, so fanning them out over threads collapses wall time from the
+    sum of the individual runtimes to the slowest one.
+
+    Args:
+        commands: List of {"command", "timeout"} dicts as stored in the
+                  pending queue
+        max_workers: Upper bound on concurrent subprocesses (default: 8)
+
+    Returns:
+        Command outputs in the same order as the input list
+    """
+    if not commands:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(commands))) as executor:
+        futures = [
+            executor.submit(
+                execute_command_directly,
+                cmd_info["command"],
+                cmd_info.get("timeout", 300),
+            )
+            for cmd_info in commands
+        ]
+        return [future.result() for future in futures]
+
+
 MAX_OUTPUT_CHARACTERS = 30000
 
 
@@ -8,6 +8,8 @@ Provides web search capabilities for the LLM agent to look up:
 - As a last resort when local resources are insufficient
 """
 
+import io
+
 from dotenv import load_dotenv
 from langchain_core.tools import tool
 from langchain_tavily import TavilySearch
@@ -54,21 +56,17 @@ def web_search(query: str) -> str:
         if not results:
             return "No search results found."
 
-        # Format the results
-        formatted_results = []
+        # Format the results incrementally: write straight into one buffer
+        # instead of growing a list of fragments and joining at the end
+        buf = io.StringIO()
         for i, result in enumerate(results, 1):
-            title = result.get("title", "No title")
-            url = result.get("url", "No URL")
-            content = result.get("content", "No content")
-
-            formatted_results.append(f"## Result {i}: {title}")
-            formatted_results.append(f"**URL**: {url}")
-            formatted_results.append(
-                f"**Content**: {content[:500]}..."
-            )  # Truncate content
-            formatted_results.append("")
+            buf.write(f"## Result {i}: {result.get('title', 'No title')}\n")
+            buf.write(f"**URL**: {result.get('url', 'No URL')}\n")
+            buf.write("**Content**: ")
+            buf.write(result.get("content", "No content")[:500])  # Truncate content
+            buf.write("...\n\n")
 
-        return "\n".join(formatted_results)
+        return buf.getvalue()
 
     except Exception as e:
         return f"Error performing web search: {str(e)}"
@@ -0,0 +1,493 @@
+"""
+Web Enumeration Tool
+
+Playwright-based analysis of web applications for the LLM agent:
+- Page title, forms, and input fields
+- Links and potentially sensitive paths
+- Heuristic checks for common web weaknesses (passive only, no exploitation)
+
+Results are returned as JSON matching the structure rendered by the
+web-enumeration display in the UI.
+"""
+
+import os
+import json
+import atexit
+import asyncio
+import threading
+from functools import lru_cache
+from typing import List
+from urllib.parse import urlsplit
+
+from dotenv import load_dotenv
+from langchain_core.tools import tool
+
+# orjson serializes C-side, several times faster than stdlib json on the
+# large payloads link-heavy pages produce; fall back silently when absent
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj)
+
+# Playwright availability is a fact that cannot change mid-process, so it
+# is resolved once here instead of with a try/except around the import on
+# every call
+try:
+    from playwright.async_api import async_playwright
+    _PW_OK = True
+except ImportError:
+    async_playwright = None
+    _PW_OK = False
+
+_PW_ERROR = "Playwright is not installed. Run 'pip install playwright' and 'playwright install'."
+
+# Env-derived settings, parsed lazily on first use and cached so importing
+# this module stays side-effect free and worker processes that never reach
+# a tool call skip the disk read entirely. MOCK_MODE (see env_example.txt)
+# serves canned analyses instead of launching a browser; DEBUG_WEB_ENUM
+# switches the payloads to pretty-printed JSON for eyeballing during
+# development, at the cost of larger strings piped back through the agent
+@lru_cache(maxsize=1)
+def _env_config() -> dict:
+    load_dotenv()
+    return {
+        "mock_mode": os.getenv("MOCK_MODE", "False").lower() == "true",
+        "debug": os.getenv("DEBUG_WEB_ENUM", "False").lower() == "true",
+    }
+
+
+def _mock_mode() -> bool:
+    return _env_config()["mock_mode"]
+
+# Canned analysis served in mock mode; callers take a shallow copy with
+# the requested URL filled in and serialize at the tool boundary, which
+# keeps the output valid JSON for any URL
+_MOCK_ANALYSIS = {
+    "url": "",
+    "title": "Mock Web Application",
+    "forms": [{
+        "action": "/login",
+        "method": "POST",
+        "inputs": [
+            {"type": "text", "name": "username", "id": "username", "placeholder": "Username"},
+            {"type": "password", "name": "password", "id": "password", "placeholder": "Password"},
+        ],
+    }],
+    "inputs": [],
+    "links": ["/", "/login", "/admin"],
+    "potential_vulnerabilities": [{
+        "type": "Unencrypted Login Form",
+        "severity": "high",
+        "description": "Password field submitted over HTTP (action: /login)",
+    }],
+    "recommendations": [
+        "Login functionality found - consider testing authentication (with permission)",
+    ],
+}
+
+# Navigation timeout for page loads (milliseconds)
+PAGE_LOAD_TIMEOUT_MS = 30000
+
+# Bounded wait for late (JS-rendered) forms and links after DOMContentLoaded.
+# Waiting for networkidle instead stalls multi-second on pages with
+# analytics beacons that never go quiet and add nothing to the enumeration
+ELEMENT_WAIT_TIMEOUT_MS = 2000
+
+# Maximum number of links included in the analysis payload. Applied
+# inside the evaluate payload so sitemap-sized pages never ship thousands
+# of hrefs across the driver boundary just to be discarded here
+MAX_LINKS = 200
+
+# Paths worth flagging when they appear in on-page links
+SENSITIVE_PATHS = [
+    "/admin", "/login", "/backup", "/config", "/phpmyadmin",
+    "/.git", "/.env", "/wp-admin", "/console", "/debug",
+]
+
+# Path segments derived from SENSITIVE_PATHS for O(1) membership tests:
+# each link costs one urlsplit plus a hash lookup per segment, regardless
+# of how many sensitive paths are tracked, and exact segment matching no
+# longer false-positives on names like /user-loginpage-tips
+_SENSITIVE_SEGMENTS = frozenset(path.lstrip("/") for path in SENSITIVE_PATHS)
+
+# In-browser extraction shared by the sync and async paths, parsed from a
+# fixed module-level string so each call transmits and evaluates the same
+# snippet instead of rebuilding it: one evaluate collects the title, the
+# forms with their inputs partitioned via closest('form') from a single
+# input scan, the standalone inputs, and the capped, noise-filtered links
+_EXTRACT_JS = """(maxLinks) => {
+    const all = [...document.querySelectorAll('input, textarea, select')].map((el) => ({
+        el: el,
+        info: {
+            type: el.getAttribute('type') || 'text',
+            name: el.getAttribute('name') || '',
+            id: el.getAttribute('id') || '',
+            placeholder: el.getAttribute('placeholder') || ''
+        }
+    }));
+    const forms = [...document.querySelectorAll('form')].map((f) => ({
+        action: f.getAttribute('action') || '',
+        method: (f.getAttribute('method') || 'GET').toUpperCase(),
+        inputs: all.filter((x) => x.el.closest('form') === f).map((x) => x.info)
+    }));
+    const links = [...document.querySelectorAll('a[href]')]
+        .map((a) => a.getAttribute('href'))
+        .filter((h) => h && !/^(mailto:|tel:|javascript:|#)/i.test(h))
+        .slice(0, maxLinks);
+    return {title: document.title, forms: forms,
+            inputs: all.map((x) => x.info), links: links};
+}"""
+
+# Resource types the enumeration never inspects; aborting them cuts the
+# bytes transferred per page load substantially and speeds up
+# domcontentloaded on asset-heavy pages
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+# Chromium subsystems the enumeration never needs; skipping them speeds
+# up cold start and shrinks the per-context memory footprint. --no-sandbox
+# is required when running as root on the Kali host
+_CHROMIUM_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-gpu",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--mute-audio",
+]
+
+
+async def _block_static_resources(route):
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# Completed analyses keyed by normalized URL: agent loops tend to revisit
+# the same target, and a dict hit is free compared to a full page load.
+# Only successful analyses are stored, so transient errors are retried
+_result_cache: dict = {}
+
+
+@lru_cache(maxsize=256)
+def _normalize_url(url: str) -> str:
+    """Normalize a target URL: default scheme and dropped fragment."""
+    if "://" not in url:
+        url = f"http://{url}"
+    return urlsplit(url)._replace(fragment="").geturl()
+
+
+# Shared Playwright/Chromium instance: launching the browser costs seconds
+# and would otherwise dominate every enumeration. Playwright connections
+# are bound to the thread (and event loop) that created them, and each
+# chat turn runs its tools on a fresh short-lived worker thread, so the
+# browser lives on one dedicated daemon thread running an event loop and
+# tool calls hand coroutines to that loop instead of touching it directly
+_loop = None
+_loop_lock = threading.Lock()
+
+_browser_pw = None
+_browser = None
+_browser_ready = asyncio.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Start the browser's event-loop thread once per process."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="web-enum-browser", daemon=True
+            ).start()
+            atexit.register(_shutdown_browser)
+            _loop = loop
+        return _loop
+
+
+def _run_on_loop(coro):
+    """Run a coroutine on the browser's loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+async def _get_browser():
+    """Launch headless Chromium once; runs on the browser's loop."""
+    global _browser_pw, _browser
+    async with _browser_ready:
+        if _browser is None:
+            _browser_pw = await async_playwright().start()
+            _browser = await _browser_pw.chromium.launch(headless=True, args=_CHROMIUM_ARGS)
+        return _browser
+
+
+async def _close_browser():
+    global _browser_pw, _browser
+    if _browser is not None:
+        await _browser.close()
+        _browser = None
+    if _browser_pw is not None:
+        await _browser_pw.stop()
+        _browser_pw = None
+
+
+def _shutdown_browser():
+    loop = _loop
+    if loop is None or not loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_close_browser(), loop).result(timeout=10)
+    except Exception:
+        pass
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def _serialize(payload) -> str:
+    """Serialize an analysis payload at the tool boundary.
+
+    Internal callers pass dicts around and only the @tool wrappers pay
+    for JSON encoding, exactly once per response.
+    """
+    if _env_config()["debug"]:
+        return json.dumps(payload, indent=2)
+    return _dumps(payload)
+
+
+def _build_analysis(extracted: dict, url: str) -> dict:
+    """Run the passive heuristics over one page's extracted elements.
+
+    Pure Python - shared by the single-URL and batch scan paths, which
+    only differ in how they drive the browser.
+    """
+    forms = extracted["forms"]
+    standalone_inputs = extracted["inputs"]
+    links = extracted["links"]  # capped at MAX_LINKS in the evaluate payload
+
+    potential_vulnerabilities = []
+    recommendations = []
+
+    # Form heuristics (unencrypted login, missing CSRF token, file upload)
+    # fused into one pass: each form's inputs are visited once and the
+    # findings derived from flags, instead of three separate loops each
+    # re-walking the same inputs
+    is_http = url.startswith("http://")
+    for form in forms:
+        has_password = False
+        has_token = False
+        file_fields = []
+        for inp in form["inputs"]:
+            input_type = inp["type"]
+            if input_type == "password":
+                has_password = True
+            elif input_type == "hidden":
+                name = inp["name"].lower()
+                if "csrf" in name or "token" in name:
+                    has_token = True
+            elif input_type == "file":
+                file_fields.append(inp["name"])
+
+        action = form["action"] or url
+        if has_password and is_http:
+            potential_vulnerabilities.append({
+                "type": "Unencrypted Login Form",
+                "severity": "high",
+                "description": f"Password field submitted over HTTP (action: {action})",
+            })
+        if form["method"] == "POST" and not has_token:
+            potential_vulnerabilities.append({
+                "type": "Possible Missing CSRF Protection",
+                "severity": "medium",
+                "description": f"POST form without a recognizable CSRF token (action: {action})",
+            })
+        for field_name in file_fields:
+            potential_vulnerabilities.append({
+                "type": "File Upload",
+                "severity": "info",
+                "description": f"File upload field '{field_name}' (action: {action})",
+            })
+
+    # Sensitive-looking paths referenced by on-page links, matched on
+    # whole path segments with an early exit per link
+    sensitive_links = []
+    for link in links:
+        path = urlsplit(link).path.lower()
+        if any(segment in _SENSITIVE_SEGMENTS for segment in path.split("/")):
+            sensitive_links.append(link)
+    if sensitive_links:
+        potential_vulnerabilities.append({
+            "type": "Sensitive Paths Referenced",
+            "severity": "info",
+            "description": f"Links point at sensitive paths: {', '.join(sorted(set(sensitive_links))[:10])}",
+        })
+
+    # Login / search functionality hints. One pass over the inputs with a
+    # single lowered name/id/placeholder blob per input, instead of
+    # re-lowering and re-concatenating the attributes for every check
+    has_login = False
+    has_search = False
+    for inp in standalone_inputs:
+        blob = (inp["name"] + inp["id"] + inp["placeholder"]).lower()
+        if not has_login and (inp["type"] == "password" or "login" in blob):
+            has_login = True
+        if not has_search and "search" in blob:
+            has_search = True
+        if has_login and has_search:
+            break
+    if has_login:
+        recommendations.append("Login functionality found - consider testing authentication (with permission)")
+    if has_search:
+        recommendations.append("Search functionality found - test input handling for injection issues")
+    if potential_vulnerabilities:
+        recommendations.append("Review the flagged findings and verify them manually before reporting")
+
+    return {
+        "url": url,
+        "title": extracted["title"],
+        "forms": forms,
+        "inputs": standalone_inputs,
+        "links": links,
+        "potential_vulnerabilities": potential_vulnerabilities,
+        "recommendations": recommendations,
+    }
+
+
+async def _enum_one(browser, url: str) -> dict:
+    """Enumerate a single URL inside a shared async browser.
+
+    All element attributes are collected in a single page.evaluate call,
+    so the Python<->driver round-trips stay constant instead of growing
+    with the number of forms, inputs, and links on the page.
+    """
+    context = await browser.new_context()
+    try:
+        await context.route("**/*", _block_static_resources)
+        page = await context.new_page()
+        await page.goto(url, wait_until="domcontentloaded", timeout=PAGE_LOAD_TIMEOUT_MS)
+        try:
+            await page.wait_for_selector(
+                "form, input, a[href]", state="attached", timeout=ELEMENT_WAIT_TIMEOUT_MS
+            )
+        except Exception:
+            pass  # page has none of these elements; analyze what is there
+        extracted = await page.evaluate(_EXTRACT_JS, MAX_LINKS)
+        return _build_analysis(extracted, url)
+    except Exception as e:
+        return {"url": url, "error": f"Error enumerating web application: {str(e)}"}
+    finally:
+        await context.close()
+
+
+async def _scan_one(url: str) -> dict:
+    """Enumerate one URL on the shared browser; runs on the browser's loop."""
+    return await _enum_one(await _get_browser(), url)
+
+
+async def _scan_many(urls: List[str]) -> List[dict]:
+    """Drive the shared browser across all URLs concurrently."""
+    browser = await _get_browser()
+    return list(await asyncio.gather(*(_enum_one(browser, url) for url in urls)))
+
+
+def enumerate_web_apps(urls: List[str]) -> List[dict]:
+    """
+    Enumerate several web applications concurrently.
+
+    Page loads are network-bound, so driving one context per URL through
+    asyncio.gather makes a batch take roughly as long as the slowest page
+    instead of the sum of all of them.
+
+    Args:
+        urls: URLs to analyze (scheme optional, defaults to http://)
+
+    Returns:
+        One analysis (or error) dict per URL, in input order
+    """
+    urls = [_normalize_url(url) for url in urls]
+
+    if not urls:
+        return []
+
+    if _mock_mode():
+        return [{**_MOCK_ANALYSIS, "url": url} for url in urls]
+
+    if not _PW_OK:
+        return [{"url": url, "error": _PW_ERROR} for url in urls]
+
+    # _enum_one only catches per-URL navigation errors; a browser launch
+    # or crash failure here must still come back as payloads, not as an
+    # exception into the agent loop
+    try:
+        return _run_on_loop(_scan_many(urls))
+    except Exception as e:
+        error = f"Error enumerating web application: {str(e)}"
+        return [{"url": url, "error": error} for url in urls]
+
+
+@tool
+def enumerate_web_application(url: str, force: bool = False) -> str:
+    """
+    Analyze a web application's attack surface with a headless browser.
+
+    Loads the page in headless Chromium and extracts the title, forms,
+    input fields, and links, then runs passive heuristic checks (login
+    forms over HTTP, missing CSRF tokens, file uploads, sensitive paths).
+    No exploitation is attempted. Successful analyses are cached per URL
+    for the session, so repeated enumerations of the same target are free.
+
+    Args:
+        url: URL of the web application (scheme optional, defaults to http://)
+        force: Re-scan even if a cached analysis exists (default: False)
+
+    Returns:
+        JSON string with the analysis results, or an error payload
+
+    Example:
+        enumerate_web_application("http://192.168.1.100")
+        enumerate_web_application("testsite.local:8080")
+    """
+    url = _normalize_url(url)
+
+    if not force and url in _result_cache:
+        return _result_cache[url]
+
+    if _mock_mode():
+        return _serialize({**_MOCK_ANALYSIS, "url": url})
+
+    if not _PW_OK:
+        return _serialize({"url": url, "error": _PW_ERROR})
+
+    try:
+        result = _run_on_loop(_scan_one(url))
+    except Exception as e:
+        return _serialize({"url": url, "error": f"Error enumerating web application: {str(e)}"})
+
+    serialized = _serialize(result)
+    if "error" not in result:
+        _result_cache[url] = serialized
+    return serialized
+
+
+@tool
+def enumerate_web_applications(urls: List[str]) -> str:
+    """
+    Analyze several web applications' attack surfaces in one call.
+
+    Runs the same passive analysis as enumerate_web_application, but loads
+    all pages concurrently, so enumerating a batch takes roughly as long as
+    the slowest page. ALWAYS prefer this over repeated single-URL calls
+    when multiple targets are known up front.
+
+    Args:
+        urls: URLs of the web applications (scheme optional, defaults to http://)
+
+    Returns:
+        JSON array with one analysis (or error payload) per URL, in input order
+
+    Example:
+        enumerate_web_applications(["http://192.168.1.100", "testsite.local:8080"])
+    """
+    return _serialize(enumerate_web_apps(urls))
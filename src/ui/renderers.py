@@ -0,0 +1,189 @@
+"""
+Chat Message Renderers
+
+Shared rendering helpers for the Streamlit chat interface:
+- Classifying message content (nmap / web enumeration / generic JSON / text)
+- Building message dicts with their render metadata
+- Displaying messages, nmap scan results, and web enumeration results
+"""
+
+import json
+from typing import Dict
+
+import streamlit as st
+
+# Severity markers for vulnerability display
+SEVERITY_COLORS = {
+    "low": "🟢",
+    "medium": "🟡",
+    "high": "🔴",
+    "critical": "🔴",
+    "info": "🔵"
+}
+
+
+def _looks_json(content: str) -> bool:
+    """Check whether the first non-whitespace character opens a JSON value.
+
+    Scans in place instead of allocating stripped copies of the content.
+    """
+    for ch in content:
+        if ch in " \t\r\n":
+            continue
+        return ch in "{["
+    return False
+
+
+@st.cache_data(max_entries=256)
+def classify(content: str):
+    """
+    Classify message content for rendering, parsing JSON at most once.
+
+    Returns a (kind, parsed) tuple where kind is one of
+    "nmap" | "web" | "json" | "text" and parsed is the decoded JSON
+    payload (or None for plain text).
+
+    Cached by content hash so identical payloads (re-classified legacy
+    messages, duplicated command outputs) skip the JSON parse entirely.
+    """
+    if _looks_json(content):
+        try:
+            parsed = json.loads(content)
+        except json.JSONDecodeError:
+            return "text", None
+        if isinstance(parsed, dict):
+            # Check if it's nmap output
+            if "nmaprun" in parsed:
+                return "nmap", parsed
+            # Check if it's web enumeration output
+            if "forms" in parsed or "potential_vulnerabilities" in parsed:
+                return "web", parsed
+        return "json", parsed
+    return "text", None
+
+
+def make_message(role: str, content: str) -> Dict:
+    """Build a message dict, classifying assistant content at append time."""
+    if role == "assistant":
+        kind, parsed = classify(content)
+    else:
+        kind, parsed = "text", None
+    return {"role": role, "content": content, "kind": kind, "parsed": parsed}
+
+
+def render_message_body(message: Dict):
+    """Render a message's content inside an already-open chat block."""
+    content = message["content"]
+
+    if message["role"] == "user":
+        st.write(content)
+        return
+
+    kind = message.get("kind")
+    if kind is None:
+        # Message predates classification - classify once and memoize
+        kind, parsed = classify(content)
+        message["kind"] = kind
+        message["parsed"] = parsed
+    renderer = RENDERERS[kind]
+    parsed = message.get("parsed")
+    renderer(parsed if parsed is not None else content)
+
+
+def display_message(message: Dict):
+    """Display a message in the chat interface."""
+    with st.chat_message(message["role"]):
+        render_message_body(message)
+
+
+def display_nmap_results(nmap_data: Dict):
+    """Display formatted nmap scan results."""
+    st.subheader("🔍 Nmap Scan Results")
+
+    if "error" in nmap_data:
+        st.error(f"Scan Error: {nmap_data['error']}")
+        return
+
+    # Display basic info
+    if "host" in nmap_data:
+        host = nmap_data["host"]
+        if isinstance(host, dict):
+            addr = host.get("address", {}).get("addr", "Unknown")
+            st.info(f"Target: {addr}")
+
+            # Display ports
+            if "ports" in host and "port" in host["ports"]:
+                ports = host["ports"]["port"]
+                if isinstance(ports, list):
+                    st.subheader("Open Ports & Services")
+                    for port in ports:
+                        if isinstance(port, dict) and port.get("state", {}).get("state") == "open":
+                            port_id = port.get("portid", "Unknown")
+                            service = port.get("service", {})
+                            service_name = service.get("name", "Unknown")
+                            product = service.get("product", "")
+                            version = service.get("version", "")
+
+                            product_part = f" ({product}{' ' + version if version else ''})" if product else ""
+                            service_info = f"{service_name}{product_part}"
+
+                            st.success(f"Port {port_id}: {service_info}")
+                else:
+                    st.write("No open ports found or unexpected data format")
+        else:
+            st.write("Unexpected host data format")
+    else:
+        st.write("No host information available")
+
+
+def display_web_enum_results(web_data: Dict):
+    """Display formatted web enumeration results."""
+    st.subheader("🌐 Web Application Analysis")
+
+    if "error" in web_data:
+        st.error(f"Enumeration Error: {web_data['error']}")
+        return
+
+    # Display basic info
+    url = web_data.get("url", "Unknown")
+    title = web_data.get("title", "No title")
+    st.info(f"URL: {url}")
+    st.info(f"Title: {title}")
+
+    # Display forms
+    forms = web_data.get("forms", [])
+    if forms:
+        st.subheader("📝 Forms Found")
+        for i, form in enumerate(forms):
+            with st.expander(f"Form {i+1}: {form.get('action', 'No action')}"):
+                st.write(f"Method: {form.get('method', 'GET')}")
+                st.write(f"Action: {form.get('action', '')}")
+                inputs = form.get("inputs", [])
+                if inputs:
+                    st.write("Inputs:")
+                    for inp in inputs:
+                        st.write(f"- {inp.get('type', 'text')}: {inp.get('name', '')} (ID: {inp.get('id', '')})")
+
+    # Display vulnerabilities
+    vulnerabilities = web_data.get("potential_vulnerabilities", [])
+    if vulnerabilities:
+        st.subheader("⚠️ Potential Vulnerabilities")
+        for vuln in vulnerabilities:
+            color = SEVERITY_COLORS.get((vuln.get("severity") or "info").lower(), "🔵")
+            st.warning(f"{color} {vuln.get('type', 'Unknown')}: {vuln.get('description', '')}")
+
+    # Display recommendations
+    recommendations = web_data.get("recommendations", [])
+    if recommendations:
+        st.subheader("💡 Recommendations")
+        for rec in recommendations:
+            st.info(f"• {rec}")
+
+
+# Renderer dispatch table keyed by the "kind" computed in classify()
+RENDERERS = {
+    "nmap": display_nmap_results,
+    "web": display_web_enum_results,
+    "json": st.json,
+    "text": st.write,
+}